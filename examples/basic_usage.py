@@ -2,6 +2,14 @@ import asyncio
 import logging
 from lucidlink_direct_links import DirectLinkManager
 
+# Use uvloop when available - it's a drop-in event loop that cuts
+# asyncio scheduling overhead for high-QPS clients like this one
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
@@ -23,9 +31,12 @@ async def main():
             "/Volumes/filespace/path to file3.doc"
         ]
         
-        # Generate direct links
-        for file_path in files:
-            direct_link = await manager.get_direct_link(file_path)
+        # Generate direct links concurrently. Awaiting get_direct_link
+        # in a for-loop would serialize one round-trip per file;
+        # get_direct_links gathers the requests so up to max_workers
+        # are in flight at once.
+        direct_links = await manager.get_direct_links(files)
+        for file_path, direct_link in zip(files, direct_links):
             print(f"File: {file_path}")
             print(f"Direct Link: {direct_link}\n")
 
@@ -1,14 +1,67 @@
 import asyncio
 import logging
+import random
+import zlib
 import aiohttp
-from typing import Optional, Dict, Any
+import orjson
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple, Union
+from functools import partial
 from urllib.parse import quote
+from yarl import URL
+
+try:
+    import httpx
+except ImportError:  # optional, only needed for http2=True
+    httpx = None
 
 logger = logging.getLogger(__name__)
 
+# Transport errors worth retrying, covering whichever client is in use
+_RETRYABLE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError) + ((httpx.HTTPError,) if httpx else ())
+
+# Only encode the absolute minimum required characters, keeping path
+# separators and most special characters as is. Binding the safe set
+# once avoids re-parsing it on every call.
+_encode_path = partial(quote, safe="/[](),-_ .")
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    """Inflate a compressed response body.
+
+    The session disables aiohttp's automatic decompression since the
+    local daemon sends plain JSON; this covers a server that compresses
+    anyway.
+    """
+    if encoding == 'gzip':
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # RFC-compliant deflate is zlib-wrapped; some servers send raw
+        # deflate anyway, so fall back (mirrors aiohttp's decompressor)
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
 class DirectLinkManager:
     """Manager for generating direct links using LucidLink API."""
-    
+
+    # Slots drop the per-instance __dict__ and speed up the attribute
+    # loads on the hot path; subclasses adding attributes must declare
+    # their own __slots__
+    __slots__ = (
+        'port', 'mount_point', 'version',
+        '_max_workers', '_retry_attempts', '_retry_delay',
+        '_filespace', '_http2', '_request_timeout',
+        '_id_cache', '_link_cache', '_link_cache_max', '_inflight',
+        '_v2_base', '_v3_base', '_v2_batch', '_v3_batch',
+        '_batch_supported',
+        '_mount_prefix', '_link_prefix',
+        '_queue', '_workers',
+        '_connector', 'session', '_http2_client',
+    )
+
     def __init__(
         self,
         port: int,
@@ -17,10 +70,12 @@ class DirectLinkManager:
         max_workers: int = 10,
         retry_attempts: int = 5,
         retry_delay: float = 0.5,
-        filespace: str = None
+        filespace: str = None,
+        http2: bool = False,
+        request_timeout: float = 10.0
     ):
         """Initialize the direct link manager.
-        
+
         Args:
             port: LucidLink API port
             mount_point: Base mount point for the filespace
@@ -29,7 +84,17 @@ class DirectLinkManager:
             retry_attempts: Number of retry attempts
             retry_delay: Delay between retries in seconds
             filespace: Optional filespace name for v2 links
+            http2: Use an HTTP/2 client (httpx) so concurrent requests
+                multiplex over a single connection; requires the
+                'http2' extra
+            request_timeout: Per-request timeout in seconds, so a
+                stalled daemon can't wedge a worker indefinitely
         """
+        if http2 and httpx is None:
+            raise ImportError(
+                "http2=True requires httpx; install with "
+                "'pip install lucidlink_direct_links[http2]'"
+            )
         self.port = port
         self.mount_point = mount_point.rstrip('/')
         self.version = version
@@ -37,20 +102,107 @@ class DirectLinkManager:
         self._retry_attempts = retry_attempts
         self._retry_delay = retry_delay
         self._filespace = filespace
+        self._http2 = http2
+        # Bound worst-case per-request time so a hung daemon can't
+        # occupy a worker forever and collapse throughput
+        self._request_timeout = aiohttp.ClientTimeout(
+            total=request_timeout,
+            connect=min(2.0, request_timeout)
+        )
         
-        self._request_semaphore = None
+        # fsEntry IDs are stable per path, so cache them to skip the
+        # API round-trip when the same path is requested again (v2)
+        self._id_cache: Dict[str, str] = {}
+
+        # Bounded LRU of fully constructed links; direct links are
+        # idempotent per path within a session, so repeat lookups are
+        # served without touching the daemon
+        self._link_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._link_cache_max = 10_000
+
+        # In-flight futures keyed by relative path; concurrent requests
+        # for the same path share one round-trip (singleflight)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Pre-built endpoint URLs; yarl encodes query params in C, so
+        # the hot path skips per-call quote() and f-string assembly
+        self._v2_base = URL(f"http://127.0.0.1:{self.port}/fsEntry")
+        self._v3_base = URL(f"http://127.0.0.1:{self.port}/fsEntry/direct-link")
+        self._v2_batch = URL(f"http://127.0.0.1:{self.port}/fsEntry/batch")
+        self._v3_batch = URL(f"http://127.0.0.1:{self.port}/fsEntry/direct-link/batch")
+        # Whether the daemon supports the batch endpoint; probed on
+        # first use and cached for the life of the manager
+        self._batch_supported = None
+
+        # Mount point and filespace are fixed per instance, so
+        # specialize the path-stripping prefix and v2 link prefix once
+        # instead of recomputing them on every request
+        self._mount_prefix = self.mount_point + '/'
+        self._link_prefix = f"lucid://{self._filespace}/file/" if self._filespace else None
+
+        self._queue = None
+        self._workers = None
+        self._connector = None
         self.session = None
-        
+        self._http2_client = None
+
     async def __aenter__(self):
         """Initialize async resources."""
-        self._request_semaphore = asyncio.Semaphore(self._max_workers)
-        self.session = aiohttp.ClientSession()
+        # A fixed pool of long-lived workers pulls requests from a
+        # queue; the pool size bounds concurrency without paying
+        # per-call semaphore and task overhead.
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(self._max_workers)
+        ]
+        if self._http2:
+            # HTTP/2 multiplexes concurrent requests over one
+            # connection, so a single keepalive socket suffices
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=self._max_workers),
+                timeout=httpx.Timeout(
+                    self._request_timeout.total,
+                    connect=self._request_timeout.connect
+                )
+            )
+            return self
+        # Tune the connection pool for repeated requests against the
+        # local LucidLink daemon: keep sockets alive well past aiohttp's
+        # 15s default so polling workloads don't pay reconnect cost.
+        self._connector = aiohttp.TCPConnector(
+            limit=self._max_workers * 2,
+            limit_per_host=self._max_workers * 2,
+            keepalive_timeout=120,
+            ttl_dns_cache=300,
+            force_close=False,
+            enable_cleanup_closed=True
+        )
+        # The daemon returns small plain JSON, so skip aiohttp's
+        # per-response decompression and auto-header machinery
+        self.session = aiohttp.ClientSession(
+            connector=self._connector,
+            headers={"Connection": "keep-alive"},
+            auto_decompress=False,
+            skip_auto_headers={"User-Agent", "Accept-Encoding"}
+        )
         return self
-        
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Cleanup async resources."""
+        if self._workers:
+            for _ in self._workers:
+                await self._queue.put(None)
+            await asyncio.gather(*self._workers)
+            self._workers = None
+            self._queue = None
+        if self._http2_client:
+            await self._http2_client.aclose()
         if self.session:
             await self.session.close()
+        if self._connector and not self._connector.closed:
+            await self._connector.close()
             
     def _encode_path_for_url(self, path: str) -> str:
         """Encode a file path for use in URLs with special handling for problematic characters.
@@ -61,81 +213,310 @@ class DirectLinkManager:
         Returns:
             URL-safe encoded path
         """
-        # Only encode the absolute minimum required characters
-        # Keep path separators and most special characters as is
-        safe_chars = "/[](),-_ ."
-        return quote(path, safe=safe_chars)
+        return _encode_path(path)
         
+    def _backoff_delay(self, attempt: int) -> float:
+        """Compute the retry delay for a given attempt.
+
+        Exponential backoff with random jitter so concurrent workers
+        don't retry in lockstep, capped at 30 seconds.
+        """
+        delay = self._retry_delay * (1 << attempt) + random.uniform(0, self._retry_delay)
+        return min(delay, 30.0)
+
     def _get_relative_path(self, path: str) -> str:
         """Convert absolute path to relative path using mount point."""
-        if path.startswith(self.mount_point):
-            return path[len(self.mount_point):].lstrip('/')
-        return path.lstrip('/')
+        if path == self.mount_point:
+            return ''
+        # str.removeprefix (3.9+) is a single C call, replacing the
+        # startswith branch plus slice
+        return path.removeprefix(self._mount_prefix).lstrip('/')
         
-    async def get_direct_link(self, file_path: str, fsentry_id: str = None) -> Optional[str]:
+    async def _http_get(self, url: URL, rel_path: str) -> Tuple[int, bytes]:
+        """Issue a single GET against the daemon on whichever transport
+        is active, returning (status, body).
+
+        400 responses are returned without a body so callers can treat
+        them as a terminal bad request; other error statuses raise.
+        """
+        if self._http2_client is not None:
+            response = await self._http2_client.get(str(url), params={"path": rel_path})
+            if response.status_code == 400:
+                return 400, b""
+            response.raise_for_status()
+            return response.status_code, response.content
+
+        async with self.session.get(url, params={"path": rel_path}, timeout=self._request_timeout) as response:
+            if response.status == 400:
+                return 400, b""
+            response.raise_for_status()
+            body = await response.read()
+            encoding = response.headers.get('Content-Encoding')
+            if encoding:
+                body = _decompress(body, encoding)
+            return response.status, body
+
+    async def _request_json(self, url: URL, rel_path: str) -> Optional[Dict[str, Any]]:
+        """Fetch and decode a JSON response with retry and backoff.
+
+        Single choke point for the per-request plumbing shared by the
+        v2 and v3 endpoints: transport errors and timeouts are retried
+        with backoff and re-raised once attempts are exhausted, while a
+        400 returns None as a terminal bad request.
+        """
+        for attempt in range(self._retry_attempts):
+            try:
+                status, body = await self._http_get(url, rel_path)
+                if status == 400:
+                    return None
+                return orjson.loads(body)
+            except _RETRYABLE_ERRORS:
+                if attempt == self._retry_attempts - 1:
+                    raise
+                await asyncio.sleep(self._backoff_delay(attempt))
+
+    async def _http_post(self, url: URL, payload: bytes) -> Tuple[int, bytes]:
+        """Issue a single JSON POST against the daemon on whichever
+        transport is active, returning (status, body).
+
+        400/404/405 responses are returned without a body so callers
+        can handle missing endpoints; other error statuses raise.
+        """
+        headers = {"Content-Type": "application/json"}
+        if self._http2_client is not None:
+            response = await self._http2_client.post(str(url), content=payload, headers=headers)
+            if response.status_code in (400, 404, 405):
+                return response.status_code, b""
+            response.raise_for_status()
+            return response.status_code, response.content
+
+        async with self.session.post(url, data=payload, headers=headers, timeout=self._request_timeout) as response:
+            if response.status in (400, 404, 405):
+                return response.status, b""
+            response.raise_for_status()
+            body = await response.read()
+            encoding = response.headers.get('Content-Encoding')
+            if encoding:
+                body = _decompress(body, encoding)
+            return response.status, body
+
+    async def _worker_loop(self):
+        """Serve queued direct link requests until a sentinel arrives."""
+        while True:
+            item = await self._queue.get()
+            try:
+                if item is None:
+                    return
+                file_path, fsentry_id, future = item
+                try:
+                    result = await self._dispatch(file_path, fsentry_id)
+                except Exception as e:
+                    if not future.cancelled():
+                        future.set_exception(e)
+                else:
+                    if not future.cancelled():
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def _dispatch(self, file_path: str, fsentry_id: Optional[str]) -> Optional[str]:
+        """Route a request to the configured API version."""
+        if self.version == 2:
+            return await self._get_direct_link_v2(file_path, fsentry_id)
+        return await self._get_direct_link_v3(file_path)
+
+    async def get_direct_link(
+        self,
+        file_path: str,
+        fsentry_id: str = None,
+        *,
+        cache: bool = True
+    ) -> Optional[str]:
         """Get direct link for a file.
-        
+
         Args:
             file_path: Path to the file
             fsentry_id: Optional fsentry ID for v2 links
-            
+            cache: Serve and populate the in-process link cache; pass
+                False to force a fresh lookup
+
         Returns:
             Direct link string or None if generation fails
         """
-        if self.version == 2:
-            return await self._get_direct_link_v2(file_path, fsentry_id)
+        if self._queue is None:
+            raise RuntimeError("Manager not initialized - use 'async with'")
+
+        use_cache = cache and fsentry_id is None
+        if use_cache:
+            key = self._get_relative_path(file_path)
+            cached_link = self._link_cache.get(key)
+            if cached_link is not None:
+                self._link_cache.move_to_end(key)
+                return cached_link
+
+            # Coalesce concurrent requests for the same path into the
+            # round-trip already in flight; shield so cancelling one
+            # waiter doesn't settle the future the others share
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        if use_cache:
+            # The worker alone settles the shared future; it is removed
+            # from the in-flight map once resolved, regardless of which
+            # callers are still around
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f, _key=key: self._inflight.pop(_key, None))
+        await self._queue.put((file_path, fsentry_id, future))
+        if use_cache:
+            direct_link = await asyncio.shield(future)
         else:
-            return await self._get_direct_link_v3(file_path)
+            direct_link = await future
+
+        if use_cache and direct_link:
+            self._link_cache[key] = direct_link
+            if len(self._link_cache) > self._link_cache_max:
+                self._link_cache.popitem(last=False)
+        return direct_link
             
+    async def get_direct_links(
+        self,
+        paths: List[str],
+        *,
+        return_exceptions: bool = True
+    ) -> List[Union[Optional[str], BaseException]]:
+        """Get direct links for multiple files concurrently.
+
+        Requests fan out via asyncio.gather and are served by the
+        worker pool, so up to max_workers requests are in flight at
+        once instead of one at a time.
+
+        Args:
+            paths: Paths to the files
+            return_exceptions: If True, per-path exceptions are returned
+                in place of links instead of cancelling the whole batch
+
+        Returns:
+            Direct links (or None/exceptions) in the same order as paths
+        """
+        return await asyncio.gather(
+            *(self.get_direct_link(path) for path in paths),
+            return_exceptions=return_exceptions
+        )
+
+    async def get_direct_links_batch(self, paths: List[str]) -> List[Union[Optional[str], BaseException]]:
+        """Get direct links for multiple files in a single request.
+
+        Sends all paths to the daemon's batch endpoint in one POST,
+        collapsing N round-trips into one. The endpoint is probed on
+        first use; if the daemon doesn't expose it, this falls back to
+        concurrent per-path requests via get_direct_links.
+
+        Args:
+            paths: Paths to the files
+
+        Returns:
+            Direct links (or None) in the same order as paths
+        """
+        if self._queue is None:
+            raise RuntimeError("Manager not initialized - use 'async with'")
+
+        if not paths:
+            return []
+
+        if self._batch_supported is False:
+            return await self.get_direct_links(paths)
+
+        rel_paths = [self._get_relative_path(path) for path in paths]
+        batch_url = self._v2_batch if self.version == 2 else self._v3_batch
+        payload = orjson.dumps({"paths": rel_paths})
+
+        try:
+            status, body = await self._http_post(batch_url, payload)
+        except _RETRYABLE_ERRORS as e:
+            logger.error(f"Batch direct link request failed: {e}")
+            return await self.get_direct_links(paths)
+
+        if status in (404, 405):
+            # Daemon doesn't implement the batch endpoint
+            self._batch_supported = False
+            logger.debug("Batch endpoint not available, falling back to per-path requests")
+            return await self.get_direct_links(paths)
+
+        if status == 400:
+            logger.warning("Batch direct link request rejected - Bad Request")
+            return await self.get_direct_links(paths)
+
+        try:
+            data = orjson.loads(body)
+            results = data.get('results') if isinstance(data, dict) else data
+            if not isinstance(results, list) or len(results) != len(paths):
+                logger.error("Unexpected batch response shape, falling back to per-path requests")
+                return await self.get_direct_links(paths)
+
+            self._batch_supported = True
+            if self.version == 2:
+                # v2 batch returns fsEntry IDs; build the links locally
+                if not self._link_prefix:
+                    logger.error("Filespace name not set")
+                    return [None] * len(paths)
+                for rel, fsentry_id in zip(rel_paths, results):
+                    if fsentry_id:
+                        self._id_cache[rel] = fsentry_id
+                return [self._link_prefix + fsentry_id if fsentry_id else None for fsentry_id in results]
+            return results
+
+        except Exception as e:
+            logger.error(f"Error processing batch response: {e}")
+            return await self.get_direct_links(paths)
+
     async def _get_direct_link_v2(self, file_path: str, fsentry_id: str = None) -> Optional[str]:
         """Get direct link using v2 API endpoint."""
         try:
             if fsentry_id:
                 # Use provided fsentry_id directly - fast path
-                if not self._filespace:
+                if not self._link_prefix:
                     logger.error("Filespace name not set")
                     return None
-                    
-                direct_link = f"lucid://{self._filespace}/file/{fsentry_id}"
+
+                direct_link = self._link_prefix + fsentry_id
                 logger.debug(f"Generated v2 direct link using provided ID for {file_path}: {direct_link}")
                 return direct_link
                 
             # Fallback to API call if no ID provided - slow path
             file_path = self._get_relative_path(file_path)
-            encoded_path = self._encode_path_for_url(file_path)
-            
+
+            # Serve repeat lookups from the in-memory ID cache
+            cached_id = self._id_cache.get(file_path)
+            if cached_id:
+                if not self._link_prefix:
+                    logger.error("Filespace name not set")
+                    return None
+                direct_link = self._link_prefix + cached_id
+                logger.debug(f"Generated v2 direct link from cached ID for {file_path}: {direct_link}")
+                return direct_link
+
             # Get the fsEntry ID from the API
-            url = f"http://127.0.0.1:{self.port}/fsEntry?path={encoded_path}"
-            
-            async with self._request_semaphore:
-                for attempt in range(self._retry_attempts):
-                    try:
-                        async with self.session.get(url) as response:
-                            if response.status == 400:
-                                logger.warning(f"Failed to generate direct link for: {file_path} - Bad Request")
-                                return None
-                                
-                            response.raise_for_status()
-                            data = await response.json()
-                            
-                            if not data or 'id' not in data:
-                                logger.error(f"Failed to get fsEntry ID for {file_path}")
-                                return None
-                                
-                            # Construct the direct link using the fsEntry ID
-                            fsentry_id = data['id']
-                            if not self._filespace:
-                                logger.error("Filespace name not set")
-                                return None
-                                
-                            direct_link = f"lucid://{self._filespace}/file/{fsentry_id}"
-                            logger.debug(f"Generated v2 direct link via API for {file_path}: {direct_link}")
-                            return direct_link
-                            
-                    except aiohttp.ClientError as e:
-                        if attempt == self._retry_attempts - 1:
-                            raise
-                        await asyncio.sleep(self._retry_delay)
+            data = await self._request_json(self._v2_base, file_path)
+            if data is None:
+                logger.warning(f"Failed to generate direct link for: {file_path} - Bad Request")
+                return None
+
+            if not data or 'id' not in data:
+                logger.error(f"Failed to get fsEntry ID for {file_path}")
+                return None
+
+            # Construct the direct link using the fsEntry ID
+            fsentry_id = data['id']
+            self._id_cache[file_path] = fsentry_id
+            if not self._link_prefix:
+                logger.error("Filespace name not set")
+                return None
+
+            direct_link = self._link_prefix + fsentry_id
+            logger.debug(f"Generated v2 direct link via API for {file_path}: {direct_link}")
+            return direct_link
                         
         except Exception as e:
             logger.error(f"Error generating v2 direct link for {file_path}: {e}")
@@ -144,34 +525,22 @@ class DirectLinkManager:
     async def _get_direct_link_v3(self, file_path: str) -> Optional[str]:
         """Get direct link using v3 API endpoint."""
         try:
-            if not self.session:
+            if not self.session and not self._http2_client:
                 raise RuntimeError("Session not initialized")
 
             file_path = self._get_relative_path(file_path)
-            encoded_path = self._encode_path_for_url(file_path)
-            url = f"http://127.0.0.1:{self.port}/fsEntry/direct-link?path={encoded_path}"
-            
-            async with self._request_semaphore:
-                for attempt in range(self._retry_attempts):
-                    try:
-                        async with self.session.get(url) as response:
-                            if response.status == 400:
-                                logger.warning(f"Failed to generate direct link for: {file_path} - Bad Request")
-                                return None
-                                
-                            response.raise_for_status()
-                            data = await response.json()
-                            
-                            if 'result' not in data:
-                                logger.warning(f"No result field in response for: {file_path}")
-                                return None
-                                
-                            return data['result']
-                            
-                    except aiohttp.ClientError as e:
-                        if attempt == self._retry_attempts - 1:
-                            raise
-                        await asyncio.sleep(self._retry_delay)
+
+            data = await self._request_json(self._v3_base, file_path)
+            if data is None:
+                logger.warning(f"Failed to generate direct link for: {file_path} - Bad Request")
+                return None
+
+            result = data.get('result')
+            if result is None:
+                logger.warning(f"No result field in response for: {file_path}")
+                return None
+
+            return result
                         
         except Exception as e:
             logger.error(f"Error generating direct link for {file_path}: {str(e)}")
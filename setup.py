@@ -8,7 +8,13 @@ setup(
     packages=find_packages(),
     install_requires=[
         "aiohttp>=3.9.0",
+        "orjson>=3.9.0",
         "requests>=2.31.0",
+        "yarl>=1.9.0",
     ],
-    python_requires=">=3.8",
+    extras_require={
+        "fast": ["uvloop>=0.19"],
+        "http2": ["httpx[http2]>=0.24.0"],
+    },
+    python_requires=">=3.9",
 )